@@ -8,6 +8,11 @@ class Settings:
     sampling_rate: int = int(os.getenv("SAMPLING_RATE", "200"))
     chunk_duration_seconds: int = int(os.getenv("CHUNK_DURATION_SECONDS", "30"))
     total_duration_seconds: int = int(os.getenv("TOTAL_DURATION_SECONDS", "90"))
+    training_n_jobs: int = int(os.getenv("TRAINING_N_JOBS", "-1"))
+    incremental_trees: int = int(os.getenv("INCREMENTAL_TREES", "10"))
+    max_trees: int = int(os.getenv("MAX_TREES", "300"))
+    drift_threshold: float = float(os.getenv("DRIFT_THRESHOLD", "0.5"))
+    max_model_versions: int = int(os.getenv("MAX_MODEL_VERSIONS", "5"))
 
 
 settings = Settings()
@@ -1,7 +1,7 @@
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 
@@ -77,45 +77,58 @@ class DataLoader:
             'event_offset_seconds': event_offset_seconds
         }
     
-    def scan_dataset(self) -> List[Dict]:
-        events = []
+    def _event_folders(self) -> List[Tuple[str, str, Path]]:
+        entries = []
         if not self.data_path.exists():
-            return events
+            return entries
         
         folders = [f for f in self.data_path.iterdir() if f.is_dir()]
         if not folders:
-            return events
+            return entries
         
         for folder in sorted(folders):
             try:
                 event_subfolders = [f for f in folder.iterdir() if f.is_dir() and f.name.startswith('event_')]
-                
-                if event_subfolders:
-                    for event_subfolder in sorted(event_subfolders):
-                        try:
-                            event_data = self.load_event_data(event_subfolder)
-                            if event_data:
-                                events.append({
-                                    'folder_name': folder.name,
-                                    'event_id': f"{folder.name}_{event_subfolder.name}",
-                                    **event_data
-                                })
-                        except Exception:
-                            continue
-                
-                if not event_subfolders:
-                    try:
-                        event_data = self.load_event_data(folder)
-                        if event_data:
-                            events.append({
-                                'folder_name': folder.name,
-                                'event_id': folder.name,
-                                **event_data
-                            })
-                    except Exception:
-                        pass
+            except Exception:
+                continue
+            
+            if event_subfolders:
+                for event_subfolder in sorted(event_subfolders):
+                    entries.append((folder.name, f"{folder.name}_{event_subfolder.name}", event_subfolder))
+            else:
+                entries.append((folder.name, folder.name, folder))
+        
+        return entries
+    
+    def scan_dataset(self) -> List[Dict]:
+        events = []
+        for folder_name, event_id, event_folder in self._event_folders():
+            try:
+                event_data = self.load_event_data(event_folder)
+                if event_data:
+                    events.append({
+                        'folder_name': folder_name,
+                        'event_id': event_id,
+                        **event_data
+                    })
             except Exception:
                 continue
         
         return events
-
+    
+    def scan_metadata(self) -> List[Dict]:
+        entries = []
+        for folder_name, event_id, event_folder in self._event_folders():
+            try:
+                metadata = self.load_event_metadata(event_folder)
+                if metadata:
+                    entries.append({
+                        'folder_name': folder_name,
+                        'event_id': event_id,
+                        'event_folder': event_folder,
+                        'metadata': metadata
+                    })
+            except Exception:
+                continue
+        
+        return entries
@@ -28,4 +28,21 @@ class DataRepository:
     def get_event_ids(self) -> List[str]:
         events = self.get_all_events()
         return [e.get('event_id', e.get('folder_name', '')) for e in events]
-
+    
+    def get_event_index(self) -> List[Dict]:
+        return self.loader.scan_metadata()
+    
+    def load_events(self, entries: List[Dict]) -> List[Dict]:
+        events = []
+        for entry in entries:
+            try:
+                event_data = self.loader.load_event_data(entry['event_folder'])
+            except Exception:
+                continue
+            if event_data:
+                events.append({
+                    'folder_name': entry['folder_name'],
+                    'event_id': entry['event_id'],
+                    **event_data
+                })
+        return events
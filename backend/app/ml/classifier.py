@@ -3,6 +3,8 @@ from typing import List, Dict
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
+import copy
+import os
 import pickle
 from pathlib import Path
 
@@ -26,21 +28,50 @@ class IClassifier(ABC):
 
 
 class ECGClassifier(IClassifier):
-    def __init__(self):
+    def __init__(self, n_jobs: int = -1):
+        self.n_jobs = n_jobs
         self.model = RandomForestClassifier(
             n_estimators=100,
             max_depth=20,
             random_state=42,
-            n_jobs=-1
+            n_jobs=n_jobs
         )
         self.scaler = StandardScaler()
+        self.stream_scaler = StandardScaler()
         self.classes_ = None
+        self.version = 0
+        self.training_events: Dict[str, Dict] = {}
     
     def train(self, X: np.ndarray, y: np.ndarray) -> None:
         X_scaled = self.scaler.fit_transform(X)
+        self.stream_scaler = StandardScaler().fit(X)
+        self.model.set_params(warm_start=False)
         self.model.fit(X_scaled, y)
         self.classes_ = self.model.classes_
     
+    def grow(self, X: np.ndarray, y: np.ndarray, n_trees: int) -> None:
+        # Existing trees split on features scaled with the fitted scaler, so
+        # new trees must see the same transform; only the streaming
+        # statistics move until the next full rebuild.
+        X_scaled = self.scaler.transform(X)
+        self.model.set_params(
+            warm_start=True,
+            n_estimators=len(self.model.estimators_) + n_trees
+        )
+        self.model.fit(X_scaled, y)
+        self.model.set_params(warm_start=False)
+    
+    def update_statistics(self, X: np.ndarray) -> None:
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        self.stream_scaler.partial_fit(X)
+    
+    def feature_drift(self) -> float:
+        if not hasattr(self.scaler, 'mean_') or not hasattr(self.stream_scaler, 'mean_'):
+            return 0.0
+        shift = np.abs(self.stream_scaler.mean_ - self.scaler.mean_) / self.scaler.scale_
+        return float(np.max(shift))
+    
     def predict(self, X: np.ndarray) -> List[str]:
         if X.ndim == 1:
             X = X.reshape(1, -1)
@@ -56,12 +87,17 @@ class ECGClassifier(IClassifier):
     
     def save(self, filepath: str) -> None:
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'wb') as f:
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'wb') as f:
             pickle.dump({
                 'model': self.model,
                 'scaler': self.scaler,
-                'classes': self.classes_
+                'stream_scaler': self.stream_scaler,
+                'classes': self.classes_,
+                'version': self.version,
+                'training_events': self.training_events
             }, f)
+        os.replace(tmp_path, filepath)
     
     def load(self, filepath: str) -> None:
         with open(filepath, 'rb') as f:
@@ -69,4 +105,12 @@ class ECGClassifier(IClassifier):
             self.model = data['model']
             self.scaler = data['scaler']
             self.classes_ = data['classes']
+            self.stream_scaler = data.get('stream_scaler')
+            if self.stream_scaler is None:
+                self.stream_scaler = copy.deepcopy(self.scaler)
+            self.version = data.get('version', 0)
+            self.training_events = data.get('training_events', {})
+        # Parallelism is a property of the process loading the model, not of
+        # the process that trained it.
+        self.model.set_params(n_jobs=self.n_jobs)
 
@@ -1,4 +1,7 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+import os
+import re
+import shutil
 import numpy as np
 from pathlib import Path
 
@@ -9,36 +12,138 @@ from app.config import settings
 
 
 class ModelTrainer:
-    def __init__(self, data_repository: DataRepository):
+    def __init__(self, data_repository: DataRepository, n_jobs: Optional[int] = None):
         self.data_repository = data_repository
-        self.classifier = ECGClassifier()
+        self.n_jobs = settings.training_n_jobs if n_jobs is None else n_jobs
+        self.classifier = ECGClassifier(n_jobs=self.n_jobs)
+    
+    @staticmethod
+    def _event_id(event: Dict) -> str:
+        return event.get('event_id', event.get('folder_name', ''))
+    
+    def _extract_rows(self, events: List[Dict]) -> Dict[str, Dict]:
+        rows = {}
+        for event in events:
+            features = FeatureExtractor.extract_features(event['combined_ecg'])
+            rows[self._event_id(event)] = {
+                'label': event['metadata'].Event_Name,
+                'features': features
+            }
+        return rows
+    
+    @staticmethod
+    def _stack(rows: Dict[str, Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        X = [row['features'] for row in rows.values()]
+        y = [row['label'] for row in rows.values()]
+        return np.array(X), np.array(y)
     
     def prepare_training_data(self) -> Tuple[np.ndarray, np.ndarray]:
         events = self.data_repository.get_all_events()
+        return self._stack(self._extract_rows(events))
+    
+    def train(self) -> ECGClassifier:
+        events = self.data_repository.get_all_events()
+        rows = self._extract_rows(events)
         
-        X = []
-        y = []
-        
-        for event in events:
-            ecg_data = event['combined_ecg']
-            features = FeatureExtractor.extract_features(ecg_data)
-            event_type = event['metadata'].Event_Name
-            
-            X.append(features)
-            y.append(event_type)
+        if len(rows) == 0:
+            raise ValueError("No training data available")
         
-        return np.array(X), np.array(y)
+        X, y = self._stack(rows)
+        self.classifier.train(X, y)
+        self.classifier.training_events = rows
+        return self.classifier
     
-    def train(self) -> ECGClassifier:
-        X, y = self.prepare_training_data()
+    def _reconcile(self) -> Tuple[Dict[str, Dict], bool]:
+        # Brings the cached rows in line with the dataset using only the
+        # metadata files; ECG chunks are loaded for newly added events alone.
+        # Returns the added rows and whether any covered event was relabeled
+        # or removed.
+        covered = self.classifier.training_events
+        index = {entry['event_id']: entry for entry in self.data_repository.get_event_index()}
+        
+        added = [entry for event_id, entry in index.items() if event_id not in covered]
+        relabeled = [
+            event_id for event_id, entry in index.items()
+            if event_id in covered and covered[event_id]['label'] != entry['metadata'].Event_Name
+        ]
+        removed = [event_id for event_id in covered if event_id not in index]
         
-        if len(X) == 0:
+        for event_id in removed:
+            del covered[event_id]
+        for event_id in relabeled:
+            covered[event_id]['label'] = index[event_id]['metadata'].Event_Name
+        added_rows = self._extract_rows(self.data_repository.load_events(added))
+        covered.update(added_rows)
+        return added_rows, bool(relabeled or removed)
+    
+    def _refit(self, rows: Dict[str, Dict]) -> ECGClassifier:
+        if len(rows) == 0:
             raise ValueError("No training data available")
         
+        self._reset_classifier()
+        X, y = self._stack(rows)
         self.classifier.train(X, y)
+        self.classifier.training_events = rows
         return self.classifier
     
-    def save_model(self, filepath: str = None) -> None:
+    def train_incremental(self, n_trees: Optional[int] = None) -> Optional[ECGClassifier]:
+        # Returns None when the saved model already covers every event.
+        if n_trees is None:
+            n_trees = settings.incremental_trees
+        if n_trees < 1:
+            raise ValueError("n_trees must be at least 1")
+        
+        if not self.load_model() or not self.classifier.training_events:
+            # No artifact, or one saved before event coverage was recorded.
+            self._reset_classifier()
+            return self.train()
+        
+        added_rows, changed = self._reconcile()
+        if not added_rows and not changed:
+            return None
+        
+        covered = self.classifier.training_events
+        X, y = self._stack(covered)
+        if changed or set(y) != set(self.classifier.classes_):
+            # Old trees would keep voting with stale labels, and a warm-started
+            # forest cannot change its class set, so refit from the cached
+            # features instead.
+            return self._refit(covered)
+        
+        X_added, _ = self._stack(added_rows)
+        self.classifier.update_statistics(X_added)
+        # New trees see every covered event (from the cached features) so
+        # that they share the forest's class set; only the delta needs
+        # feature extraction.
+        self.classifier.grow(X, y, n_trees)
+        return self.classifier
+    
+    def _reset_classifier(self) -> None:
+        # Full retrains start from a fresh forest but keep version numbering.
+        version = self.classifier.version
+        self.classifier = ECGClassifier(n_jobs=self.n_jobs)
+        self.classifier.version = version
+    
+    def needs_compaction(self) -> bool:
+        return (
+            len(self.classifier.model.estimators_) > settings.max_trees
+            or self.classifier.feature_drift() > settings.drift_threshold
+        )
+    
+    def compact(self, force: bool = False) -> Optional[ECGClassifier]:
+        # Full rebuild, run on a schedule; returns None when the saved model
+        # has not drifted.
+        if not self.load_model() or not self.classifier.training_events:
+            self._reset_classifier()
+            return self.train()
+        
+        added_rows, changed = self._reconcile()
+        if not force and not added_rows and not changed and not self.needs_compaction():
+            return None
+        
+        return self._refit(self.classifier.training_events)
+    
+    def _resolve_model_path(self, filepath: str = None) -> str:
         if filepath is None:
             if settings.model_path:
                 model_path = Path(settings.model_path)
@@ -50,6 +155,34 @@ class ModelTrainer:
                 model_dir = Path("./models")
                 model_dir.mkdir(exist_ok=True)
                 filepath = str(model_dir / "ecg_classifier.pkl")
+        return filepath
+    
+    def load_model(self, filepath: str = None) -> bool:
+        model_file = Path(self._resolve_model_path(filepath))
+        if not model_file.is_file():
+            return False
+        self.classifier.load(str(model_file))
+        return True
+    
+    def save_model(self, filepath: str = None) -> None:
+        model_file = Path(self._resolve_model_path(filepath))
         
-        self.classifier.save(filepath)
-
+        pattern = re.compile(rf"^{re.escape(model_file.stem)}\.v(\d+){re.escape(model_file.suffix)}$")
+        versioned_files = {}
+        for f in model_file.parent.glob("*"):
+            match = pattern.match(f.name)
+            if match:
+                versioned_files[int(match.group(1))] = f
+        self.classifier.version = max(list(versioned_files) + [self.classifier.version]) + 1
+        
+        versioned_file = model_file.with_name(
+            f"{model_file.stem}.v{self.classifier.version}{model_file.suffix}"
+        )
+        self.classifier.save(str(versioned_file))
+        tmp_file = f"{model_file}.tmp"
+        shutil.copyfile(versioned_file, tmp_file)
+        os.replace(tmp_file, model_file)
+        
+        keep = max(settings.max_model_versions - 1, 0)
+        for version in sorted(versioned_files)[:max(len(versioned_files) - keep, 0)]:
+            versioned_files[version].unlink(missing_ok=True)
@@ -0,0 +1,168 @@
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.ml.classifier import ECGClassifier
+from app.ml.model_trainer import ModelTrainer
+
+CLASS_CENTERS = {'AFIB': 0.0, 'BRADY': 10.0, 'VTACH': 20.0}
+
+
+def make_event(event_id: str, label: str, center: float) -> dict:
+    rng = np.random.default_rng(zlib.crc32(event_id.encode()))
+    return {
+        'event_id': event_id,
+        'folder_name': event_id,
+        'metadata': SimpleNamespace(Event_Name=label),
+        'combined_ecg': rng.normal(center, 0.5, size=4)
+    }
+
+
+class FakeRepository:
+    def __init__(self, events):
+        self.events = events
+        self.loaded_ids = []
+    
+    def get_all_events(self, force_reload: bool = False):
+        self.loaded_ids.extend(e['event_id'] for e in self.events)
+        return self.events
+    
+    def get_event_index(self):
+        return [
+            {'event_id': e['event_id'], 'folder_name': e['folder_name'], 'metadata': e['metadata']}
+            for e in self.events
+        ]
+    
+    def load_events(self, entries):
+        wanted = {entry['event_id'] for entry in entries}
+        events = [e for e in self.events if e['event_id'] in wanted]
+        self.loaded_ids.extend(e['event_id'] for e in events)
+        return events
+
+
+@pytest.fixture(autouse=True)
+def synthetic_features(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, 'model_path', str(tmp_path))
+    monkeypatch.setattr(
+        'app.ml.model_trainer.FeatureExtractor.extract_features',
+        staticmethod(lambda ecg: np.asarray(ecg, dtype=float))
+    )
+
+
+@pytest.fixture
+def events():
+    return [
+        make_event(f"{label}_{i}", label, center)
+        for label, center in CLASS_CENTERS.items()
+        for i in range(8)
+    ]
+
+
+def trained_repository(events) -> FakeRepository:
+    trainer = ModelTrainer(FakeRepository(events), n_jobs=1)
+    trainer.train()
+    trainer.save_model()
+    return FakeRepository(events)
+
+
+def test_incremental_grows_forest_for_added_events(events):
+    repo = trained_repository(events)
+    repo.events.append(make_event('AFIB_new', 'AFIB', CLASS_CENTERS['AFIB']))
+    
+    trainer = ModelTrainer(repo, n_jobs=1)
+    classifier = trainer.train_incremental(n_trees=5)
+    
+    assert len(classifier.model.estimators_) == 105
+    assert repo.loaded_ids == ['AFIB_new']
+    assert 'AFIB_new' in classifier.training_events
+
+
+def test_incremental_without_changes_returns_none(events):
+    repo = trained_repository(events)
+    
+    assert ModelTrainer(repo, n_jobs=1).train_incremental() is None
+    assert repo.loaded_ids == []
+
+
+def test_incremental_rejects_non_positive_trees(events):
+    repo = trained_repository(events)
+    
+    with pytest.raises(ValueError):
+        ModelTrainer(repo, n_jobs=1).train_incremental(n_trees=0)
+
+
+def test_relabel_refits_from_cached_features(events):
+    repo = trained_repository(events)
+    relabeled = [e for e in repo.events if e['metadata'].Event_Name == 'VTACH'][:3]
+    for event in relabeled:
+        event['metadata'] = SimpleNamespace(Event_Name='BRADY')
+    
+    trainer = ModelTrainer(repo, n_jobs=1)
+    classifier = trainer.train_incremental()
+    
+    assert len(classifier.model.estimators_) == 100
+    assert repo.loaded_ids == []
+    X = np.array([classifier.training_events[e['event_id']]['features'] for e in relabeled])
+    assert classifier.predict(X) == ['BRADY', 'BRADY', 'BRADY']
+
+
+def test_removed_event_refits_and_drops_row(events):
+    repo = trained_repository(events)
+    removed = repo.events.pop()
+    
+    classifier = ModelTrainer(repo, n_jobs=1).train_incremental()
+    
+    assert removed['event_id'] not in classifier.training_events
+    assert classifier.stream_scaler.n_samples_seen_ == len(repo.events)
+
+
+def test_new_class_resets_grown_forest(events):
+    repo = trained_repository(events)
+    repo.events.append(make_event('AFIB_new', 'AFIB', CLASS_CENTERS['AFIB']))
+    trainer = ModelTrainer(repo, n_jobs=1)
+    trainer.train_incremental(n_trees=5)
+    trainer.save_model()
+    
+    repo.events.append(make_event('PAUSE_0', 'PAUSE', 40.0))
+    trainer = ModelTrainer(repo, n_jobs=1)
+    classifier = trainer.train_incremental(n_trees=5)
+    
+    assert len(classifier.model.estimators_) == 100
+    assert 'PAUSE' in classifier.classes_
+    assert classifier.version == 2
+
+
+def test_compact_skips_without_drift_and_rebuilds_from_cache(events):
+    repo = trained_repository(events)
+    
+    assert ModelTrainer(repo, n_jobs=1).compact() is None
+    
+    classifier = ModelTrainer(repo, n_jobs=1).compact(force=True)
+    assert len(classifier.model.estimators_) == 100
+    assert repo.loaded_ids == []
+
+
+def test_save_model_numbers_and_prunes_versions(events, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'max_model_versions', 2)
+    trainer = ModelTrainer(FakeRepository(events), n_jobs=1)
+    trainer.train()
+    for _ in range(4):
+        trainer.save_model()
+    
+    names = sorted(f.name for f in tmp_path.iterdir())
+    assert names == ['ecg_classifier.pkl', 'ecg_classifier.v3.pkl', 'ecg_classifier.v4.pkl']
+    loaded = ECGClassifier()
+    loaded.load(str(tmp_path / 'ecg_classifier.pkl'))
+    assert loaded.version == 4
+
+
+def test_load_keeps_loader_n_jobs(events, tmp_path):
+    trained_repository(events)
+    
+    classifier = ECGClassifier()
+    classifier.load(str(tmp_path / 'ecg_classifier.pkl'))
+    
+    assert classifier.model.n_jobs == -1
@@ -1,28 +1,48 @@
-import sys
-from pathlib import Path
+import argparse
 
 from app.data.data_repository import DataRepository
 from app.ml.model_trainer import ModelTrainer
 from app.config import settings
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
 def main():
-    if len(sys.argv) > 1:
-        data_path = sys.argv[1]
-    else:
-        data_path = settings.data_path
-    
-    data_repo = DataRepository(data_path=data_path)
-    events = data_repo.get_all_events()
+    parser = argparse.ArgumentParser(description="Train the ECG event classifier")
+    parser.add_argument("data_path", nargs="?", default=settings.data_path)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--incremental", action="store_true",
+                      help="update the saved model with added, relabeled or removed events")
+    mode.add_argument("--compact", action="store_true",
+                      help="rebuild the saved model from scratch if drift is detected")
+    parser.add_argument("--force", action="store_true",
+                        help="with --compact, rebuild even without drift")
+    parser.add_argument("--trees", type=positive_int, default=settings.incremental_trees,
+                        help="trees to add per incremental run")
+    parser.add_argument("--n-jobs", type=int, default=settings.training_n_jobs,
+                        help="parallel jobs for tree fitting (-1 uses all cores)")
+    args = parser.parse_args()
     
-    if len(events) == 0:
+    data_repo = DataRepository(data_path=args.data_path)
+    if len(data_repo.get_event_index()) == 0:
         return
     
-    trainer = ModelTrainer(data_repo)
-    classifier = trainer.train()
-    trainer.save_model()
+    trainer = ModelTrainer(data_repo, n_jobs=args.n_jobs)
+    if args.incremental:
+        classifier = trainer.train_incremental(n_trees=args.trees)
+    elif args.compact:
+        classifier = trainer.compact(force=args.force)
+    else:
+        classifier = trainer.train()
+    
+    if classifier is not None:
+        trainer.save_model()
 
 
 if __name__ == "__main__":
     main()
-